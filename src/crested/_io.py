@@ -4,7 +4,9 @@ from __future__ import annotations
 
 import os
 import re
-from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from importlib.util import find_spec
 from os import PathLike
 from pathlib import Path
 
@@ -16,6 +18,13 @@ from anndata import AnnData
 from loguru import logger
 from scipy.sparse import csr_matrix
 
+# pyarrow parses CSV files multithreaded, fall back to the C parser if it's not installed
+if find_spec("pyarrow") is not None:
+    import pyarrow as pa
+    from pyarrow import csv as pa_csv
+else:
+    pa_csv = None
+
 
 def _sort_files(filename: PathLike):
     """Sorts files.
@@ -40,19 +49,98 @@ def _sort_files(filename: PathLike):
     )
 
 
-def _custom_region_sort(region: str) -> tuple[int, int, int]:
-    """Sort regions in the format chr:start-end."""
-    chrom, pos = region.split(":")
-    start, _ = map(int, pos.split("-"))
+def _sort_regions(regions: pd.DataFrame) -> pd.DataFrame:
+    """Sort BED regions on chromosome and start.
+
+    Chromosomes named 'chrX' or 'chromX' (X=int) are sorted numerically and come first,
+    other chromosomes are sorted alphabetically afterwards.
+    """
+    chrom_num = pd.to_numeric(
+        regions[0].str.extract(r"^(?:chr|chrom)(\d+)", flags=re.IGNORECASE)[0]
+    )
+    sort_keys = pd.DataFrame(
+        {
+            "non_numeric": chrom_num.isna(),
+            "chrom_num": chrom_num,
+            "chrom": regions[0].where(chrom_num.isna(), ""),
+            "start": regions[1],
+            "end": regions[2],
+        }
+    )
+    order = sort_keys.sort_values(list(sort_keys.columns), kind="stable").index
+    return regions.loc[order].reset_index(drop=True)
+
 
-    # check if the chromosome part contains digits
-    numeric_match = re.match(r"chr(\d+)|chrom(\d+)", chrom, re.IGNORECASE)
+def _read_bed_regions(bed_file: PathLike, use_threads: bool = True) -> pd.DataFrame:
+    """Read the chromosome, start and end columns of a BED file.
 
-    if numeric_match:
-        chrom_num = int(numeric_match.group(1) or numeric_match.group(2))
-        return (0, chrom_num, start)
-    else:
-        return (1, chrom, start)
+    The column types are passed to the parser, so chromosome names without a 'chr' prefix are never inferred as numbers.
+    Set use_threads to False when reading many files in a thread pool, so pyarrow does not start a pool of its own per file.
+    """
+    if pa_csv is None:
+        return pd.read_csv(
+            bed_file,
+            sep="\t",
+            header=None,
+            usecols=[0, 1, 2],
+            dtype={0: str, 1: np.int32, 2: np.int32},
+        )
+    # pandas' pyarrow engine only applies dtypes after inferring them, so use pyarrow directly
+    table = pa_csv.read_csv(
+        str(bed_file),
+        read_options=pa_csv.ReadOptions(
+            autogenerate_column_names=True, use_threads=use_threads
+        ),
+        parse_options=pa_csv.ParseOptions(delimiter="\t"),
+        convert_options=pa_csv.ConvertOptions(
+            column_types={"f0": pa.string(), "f1": pa.int32(), "f2": pa.int32()},
+            include_columns=["f0", "f1", "f2"],
+        ),
+    )
+    return table.to_pandas().set_axis([0, 1, 2], axis=1)
+
+
+def _regions_index(regions: pd.DataFrame) -> pd.MultiIndex:
+    """Index BED regions on (chromosome, start, end) for fast region lookups."""
+    return pd.MultiIndex.from_arrays(
+        [regions[0], regions[1].astype(np.int64), regions[2].astype(np.int64)]
+    )
+
+
+def _region_names(regions: pd.DataFrame) -> pd.Series:
+    """Get region names in the format chr:start-end from a BED dataframe."""
+    return (
+        regions[0].astype(str)
+        + ":"
+        + regions[1].astype(str)
+        + "-"
+        + regions[2].astype(str)
+    )
+
+
+def _build_binary_matrix(class_cols: list[np.ndarray], n_regions: int) -> csr_matrix:
+    """Build a binary int8 (classes, regions) matrix from the region columns present in each class."""
+    class_cols = [np.unique(np.asarray(cols, dtype=np.int64)) for cols in class_cols]
+    rows = np.repeat(np.arange(len(class_cols)), [len(cols) for cols in class_cols])
+    cols = np.concatenate(class_cols) if class_cols else np.empty(0, dtype=np.int64)
+    matrix = csr_matrix(
+        (np.ones(len(cols), dtype=np.int8), (rows, cols)),
+        shape=(len(class_cols), n_regions),
+    )
+    # canonical format (sorted, no duplicates) enables scipy's fast slicing paths
+    matrix.sum_duplicates()
+    matrix.indices = matrix.indices.astype(np.int32, copy=False)
+    matrix.indptr = matrix.indptr.astype(np.int32, copy=False)
+    return matrix
+
+
+def _region_coordinates(regions: pd.DataFrame) -> dict[str, np.ndarray]:
+    """Get the chromosome, start and end columns of BED regions for AnnData.var."""
+    return {
+        "chr": regions[0].to_numpy(),
+        "start": regions[1].to_numpy(dtype=int),
+        "end": regions[2].to_numpy(dtype=int),
+    }
 
 
 def _read_chromsizes(chromsizes_file: PathLike) -> dict[str, int]:
@@ -109,30 +197,18 @@ def _read_consensus_regions(
     regions_file: PathLike, chromsizes_file: PathLike | None = None
 ) -> pd.DataFrame:
     """Read consensus regions BED file and filter out regions not within chromosomes."""
-    consensus_peaks = pd.read_csv(
-        regions_file,
-        sep="\t",
-        header=None,
-        usecols=[0, 1, 2],
-        dtype={0: str, 1: "Int32", 2: "Int32"},
-    )
-    consensus_peaks["region"] = (
-        consensus_peaks[0].astype(str)
-        + ":"
-        + consensus_peaks[1].astype(str)
-        + "-"
-        + consensus_peaks[2].astype(str)
-    )
+    consensus_peaks = _read_bed_regions(regions_file)
+    consensus_peaks["region"] = _region_names(consensus_peaks)
 
     if chromsizes_file:
         chromsizes_dict = _read_chromsizes(chromsizes_file)
-        valid_mask = consensus_peaks.apply(
-            lambda row: row[0] in chromsizes_dict
-            and row[1] >= 0
-            and row[2] <= chromsizes_dict[row[0]],
-            axis=1,
+        sizes = consensus_peaks[0].map(chromsizes_dict)
+        valid_mask = (
+            sizes.notna().to_numpy()
+            & (consensus_peaks[1].to_numpy() >= 0)
+            & (consensus_peaks[2].to_numpy() <= sizes.to_numpy())
         )
-        consensus_peaks_filtered = consensus_peaks[valid_mask]
+        consensus_peaks_filtered = consensus_peaks.loc[valid_mask]
 
         if len(consensus_peaks) != len(consensus_peaks_filtered):
             logger.warning(
@@ -148,13 +224,11 @@ def _create_temp_bed_file(
 ) -> str:
     """Adjust consensus regions to a target width and create a temporary BED file."""
     adjusted_peaks = consensus_peaks.copy()
-    adjusted_peaks[1] = adjusted_peaks.apply(
-        lambda row: max(0, row[1] - (target_region_width - (row[2] - row[1])) // 2),
-        axis=1,
-    )
-    adjusted_peaks[2] = adjusted_peaks[1] + target_region_width
-    adjusted_peaks[1] = adjusted_peaks[1].astype(int)
-    adjusted_peaks[2] = adjusted_peaks[2].astype(int)
+    starts = adjusted_peaks[1].to_numpy(dtype=np.int64)
+    ends = adjusted_peaks[2].to_numpy(dtype=np.int64)
+    starts = np.maximum(0, starts - (target_region_width - (ends - starts)) // 2)
+    adjusted_peaks[1] = starts
+    adjusted_peaks[2] = starts + target_region_width
 
     # Create a temporary BED file
     temp_bed_file = "temp_adjusted_regions.bed"
@@ -254,119 +328,109 @@ def import_beds(
             "Chromsizes file not provided. Will not check if regions are within chromosomes",
             stacklevel=1,
         )
+    bed_files = sorted(beds_folder.glob("*.bed"), key=_sort_files)
     if classes_subset is not None:
-        for classname in classes_subset:
-            if not any(beds_folder.glob(f"{classname}.bed")):
-                raise FileNotFoundError(f"'{classname}' not found in '{beds_folder}'")
+        available_classes = {file.stem for file in bed_files}
+        missing_classes = [
+            classname
+            for classname in classes_subset
+            if classname not in available_classes
+        ]
+        if missing_classes:
+            raise FileNotFoundError(
+                f"Classes {missing_classes} not found in '{beds_folder}'"
+            )
+        classes_subset = set(classes_subset)
+
+    class_files = [
+        file
+        for file in bed_files
+        if classes_subset is None or file.stem in classes_subset
+    ]
+    class_names = np.array([file.stem for file in class_files], dtype=object)
+    file_paths = np.array([str(file) for file in class_files], dtype=object)
 
     if regions_file:
         # Read consensus regions BED file and filter out regions not within chromosomes
         _check_bed_file_format(regions_file)
         consensus_peaks = _read_consensus_regions(regions_file, chromsizes_file)
 
-        binary_matrix = pd.DataFrame(0, index=[], columns=consensus_peaks["region"])
-        file_paths = []
+        regions = consensus_peaks
+        region_names = regions["region"].to_numpy()
+        regions_index = _regions_index(regions)
+
+        def _read_class_cols(file: Path) -> np.ndarray:
+            """Columns of the consensus regions present in a class BED file."""
+            cols = regions_index.get_indexer_for(
+                _regions_index(_read_bed_regions(file, use_threads=False))
+            )
+            return cols[cols >= 0]
 
-        # Which regions are present in the consensus regions
         logger.info(
             f"Reading bed files from {beds_folder} and using {regions_file} as var_names..."
         )
-        for file in sorted(beds_folder.glob("*.bed"), key=_sort_files):
-            class_name = file.stem
-            if classes_subset is None or class_name in classes_subset:
-                class_regions = pd.read_csv(
-                    file, sep="\t", header=None, usecols=[0, 1, 2]
-                )
-                class_regions["region"] = (
-                    class_regions[0].astype(str)
-                    + ":"
-                    + class_regions[1].astype(str)
-                    + "-"
-                    + class_regions[2].astype(str)
-                )
-
-                # Create binary row for the current topic
-                binary_row = binary_matrix.columns.isin(class_regions["region"]).astype(
-                    int
-                )
-                binary_matrix.loc[class_name] = binary_row
-                file_paths.append(str(file))
+        # both the pandas and pyarrow parsers release the GIL, so the BED files are read
+        # in threads, each parsed single threaded to not oversubscribe the cores
+        with ThreadPoolExecutor() as executor:
+            class_cols = list(executor.map(_read_class_cols, class_files))
 
     # else, get regions from the bed files
     else:
-        file_paths = []
-        all_regions = set()
-
-        # Collect all regions from the BED files
         logger.info(
             f"Reading bed files from {beds_folder} without consensus regions..."
         )
-        for file in sorted(beds_folder.glob("*.bed"), key=_sort_files):
-            class_name = file.stem
-            if classes_subset is None or class_name in classes_subset:
-                _check_bed_file_format(file)
-                class_regions = pd.read_csv(
-                    file, sep="\t", header=None, usecols=[0, 1, 2]
-                )
-                class_regions["region"] = (
-                    class_regions[0].astype(str)
-                    + ":"
-                    + class_regions[1].astype(str)
-                    + "-"
-                    + class_regions[2].astype(str)
-                )
-                all_regions.update(class_regions["region"].tolist())
-                file_paths.append(str(file))
-
-        # Convert set to sorted list
-        all_regions = sorted(all_regions, key=_custom_region_sort)
-        binary_matrix = pd.DataFrame(0, index=[], columns=all_regions)
-
-        # Populate the binary matrix
-        for file in file_paths:
-            class_name = Path(file).stem
-            class_regions = pd.read_csv(file, sep="\t", header=None, usecols=[0, 1, 2])
-            class_regions["region"] = (
-                class_regions[0].astype(str)
-                + ":"
-                + class_regions[1].astype(str)
-                + "-"
-                + class_regions[2].astype(str)
+        for file in class_files:
+            _check_bed_file_format(file)
+        with ThreadPoolExecutor() as executor:
+            class_regions_list = list(
+                executor.map(partial(_read_bed_regions, use_threads=False), class_files)
             )
-            binary_row = binary_matrix.columns.isin(class_regions["region"]).astype(int)
-            binary_matrix.loc[class_name] = binary_row
 
-    ann_data = AnnData(
-        binary_matrix,
-    )
-
-    ann_data.obs["file_path"] = file_paths
-    ann_data.obs["n_open_regions"] = ann_data.X.sum(axis=1)
-    ann_data.var["n_classes"] = ann_data.X.sum(axis=0)
-    ann_data.var["chr"] = ann_data.var.index.str.split(":").str[0]
-    ann_data.var["start"] = (
-        ann_data.var.index.str.split(":").str[1].str.split("-").str[0]
-    ).astype(int)
-    ann_data.var["end"] = (
-        ann_data.var.index.str.split(":").str[1].str.split("-").str[1]
-    ).astype(int)
+        regions = _sort_regions(
+            pd.concat(class_regions_list, ignore_index=True).drop_duplicates()
+        )
+        region_names = _region_names(regions).to_numpy()
+        regions_index = _regions_index(regions)
+        class_cols = [
+            regions_index.get_indexer(_regions_index(class_regions))
+            for class_regions in class_regions_list
+        ]
 
-    if compress:
-        ann_data.X = csr_matrix(ann_data.X)
+    binary_matrix = _build_binary_matrix(class_cols, n_regions=len(region_names))
+    # counts are bounded by the number of classes and regions, so int32 can't overflow
+    n_open_regions = np.asarray(binary_matrix.sum(axis=1, dtype=np.int32)).ravel()
+    n_classes = np.asarray(binary_matrix.sum(axis=0, dtype=np.int32)).ravel()
 
     # Output checks
-    classes_no_open_regions = ann_data.obs[ann_data.obs["n_open_regions"] == 0]
-    if not classes_no_open_regions.empty:
+    if (n_open_regions == 0).any():
         raise ValueError(
-            f"{classes_no_open_regions.index} have 0 open regions in the consensus peaks"
+            f"{pd.Index(class_names[n_open_regions == 0])} have 0 open regions in the consensus peaks"
         )
-    regions_no_classes = ann_data.var[ann_data.var["n_classes"] == 0]
-    if not regions_no_classes.empty:
-        if remove_empty_regions:
-            logger.warning(
-                f"{len(regions_no_classes.index)} consensus regions are not open in any class. Removing them from the AnnData object. Disable this behavior by setting 'remove_empty_regions=False'",
-            )
-            ann_data = ann_data[:, ann_data.var["n_classes"] > 0]
+    open_regions = n_classes > 0
+    if remove_empty_regions and not open_regions.all():
+        logger.warning(
+            f"{open_regions.size - open_regions.sum()} consensus regions are not open in any class. Removing them from the AnnData object. Disable this behavior by setting 'remove_empty_regions=False'",
+        )
+        # Drop the regions before building the AnnData to avoid copying a sliced AnnData
+        binary_matrix = binary_matrix[:, open_regions]
+        region_names = region_names[open_regions]
+        n_classes = n_classes[open_regions]
+        regions = regions[open_regions]
+
+    if not compress:
+        binary_matrix = binary_matrix.toarray()
+
+    ann_data = AnnData(
+        binary_matrix,
+        obs=pd.DataFrame(
+            {"file_path": file_paths, "n_open_regions": n_open_regions},
+            index=class_names,
+        ),
+        var=pd.DataFrame(
+            {"n_classes": n_classes, **_region_coordinates(regions)},
+            index=region_names,
+        ),
+    )
 
     return ann_data
 
@@ -485,33 +549,24 @@ def import_bigwigs(
 
     data_matrix = np.vstack(all_results)
 
-    # Create DataFrame for AnnData
-    df = pd.DataFrame(
-        data_matrix,
-        columns=consensus_peaks["region"],
-        index=[
-            os.path.basename(file).rpartition(".")[0].replace(".", "_")
-            for file in bw_files
-        ],
-    )
-
     # Create AnnData object
-    ann_data = ad.AnnData(df)
-
-    ann_data.obs["file_path"] = bw_files
-    ann_data.var["chr"] = ann_data.var.index.str.split(":").str[0]
-    ann_data.var["start"] = (
-        ann_data.var.index.str.split(":").str[1].str.split("-").str[0]
-    ).astype(int)
-    ann_data.var["end"] = (
-        ann_data.var.index.str.split(":").str[1].str.split("-").str[1]
-    ).astype(int)
-
-    if compress:
-        ann_data.X = csr_matrix(ann_data.X)
+    ann_data = ad.AnnData(
+        csr_matrix(data_matrix) if compress else data_matrix,
+        obs=pd.DataFrame(
+            {"file_path": bw_files},
+            index=[
+                os.path.basename(file).rpartition(".")[0].replace(".", "_")
+                for file in bw_files
+            ],
+        ),
+        var=pd.DataFrame(
+            _region_coordinates(consensus_peaks),
+            index=consensus_peaks["region"].to_numpy(),
+        ),
+    )
 
     # Output checks
-    regions_no_values = ann_data.var[ann_data.X.sum(axis=0) == 0]
+    regions_no_values = ann_data.var[data_matrix.sum(axis=0) == 0]
     if not regions_no_values.empty:
         logger.warning(
             f"{len(regions_no_values.index)} consensus regions have no values in any bigWig file",
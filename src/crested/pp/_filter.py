@@ -5,7 +5,7 @@ from anndata import AnnData
 from loguru import logger
 from scipy.sparse import csr_matrix
 
-from ._utils import _calc_gini, _calc_proportion
+from ._utils import _calc_gini, _calc_gini_scores, _calc_proportion
 
 
 def filter_regions_on_specificity(
@@ -59,14 +59,14 @@ def filter_regions_on_specificity(
             )
         target_matrix = adata.layers[model_name].T
 
-    gini_scores = _calc_gini(target_matrix)
-    mean = np.mean(np.max(gini_scores, axis=1))
-    std_dev = np.std(np.max(gini_scores, axis=1))
+    gini_scores = _calc_gini_scores(target_matrix)
+    mean = np.mean(gini_scores)
+    std_dev = np.std(gini_scores)
     gini_threshold = mean + gini_std_threshold * std_dev
-    selected_indices = np.argwhere(np.max(gini_scores, axis=1) > gini_threshold)[:, 0]
+    selected_mask = gini_scores > gini_threshold
 
-    target_matrix_filt = target_matrix[selected_indices]
-    regions_filt = adata.var_names[selected_indices]
+    target_matrix_filt = target_matrix[selected_mask]
+    regions_filt = adata.var_names[selected_mask]
 
     logger.info(
         f"After specificity filtering, kept {len(target_matrix_filt)} out of {target_matrix.shape[0]} regions."
@@ -7,7 +7,7 @@ from anndata import AnnData
 from loguru import logger
 from scipy.sparse import csr_matrix
 
-from ._utils import _calc_gini
+from ._utils import _calc_gini_scores
 
 
 def normalize_peaks(
@@ -64,9 +64,9 @@ def normalize_peaks(
     all_low_gini_indices = set()
     gini_scores_all = []
 
-    overall_gini_scores = _calc_gini(target_matrix)
-    mean = np.mean(np.max(overall_gini_scores, axis=1))
-    std_dev = np.std(np.max(overall_gini_scores, axis=1))
+    overall_gini_scores = _calc_gini_scores(target_matrix)
+    mean = np.mean(overall_gini_scores)
+    std_dev = np.std(overall_gini_scores)
     gini_threshold = mean - gini_std_threshold * std_dev
 
     logger.info("Filtering on top k Gini scores...")
@@ -76,12 +76,12 @@ def normalize_peaks(
         top_k_index = int(len(sorted_col) * top_k_percent)
 
         top_indices = np.argsort(filtered_col)[::-1][:top_k_index]
-        gini_scores = _calc_gini(target_matrix[top_indices])
-        low_gini_indices = np.where(np.max(gini_scores, axis=1) < gini_threshold)[0]
+        gini_scores = _calc_gini_scores(target_matrix[top_indices])
+        low_gini_indices = np.where(gini_scores < gini_threshold)[0]
 
         if len(low_gini_indices) > 0:
             top_k_mean = np.mean(sorted_col[low_gini_indices])
-            gini_scores_all.append(np.max(gini_scores[low_gini_indices], axis=1))
+            gini_scores_all.append(gini_scores[low_gini_indices])
             all_low_gini_indices.update(top_indices[low_gini_indices])
         else:
             top_k_mean = 0
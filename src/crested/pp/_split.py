@@ -4,7 +4,6 @@ from __future__ import annotations
 
 import math
 import warnings
-from collections import defaultdict
 
 import numpy as np
 import pandas as pd
@@ -14,6 +13,19 @@ from loguru import logger
 __all__ = ["train_val_test_split"]
 
 
+def _get_chromosomes(regions: list[str]) -> np.ndarray:
+    """Get the chromosome of each region string formatted as 'chr:start-end'."""
+    return pd.Series(regions, dtype=str).str.partition(":")[0].to_numpy()
+
+
+def _n_chroms_to_reach(chrom_counts: np.ndarray, target_size: int) -> int:
+    """Get the number of leading chromosomes needed for their regions to reach the target size."""
+    if target_size <= 0:
+        return 0
+    n_chroms = np.searchsorted(np.cumsum(chrom_counts), target_size, side="left") + 1
+    return int(min(n_chroms, len(chrom_counts)))
+
+
 def _split_by_chromosome_auto(
     regions: list[str], val_fraction: float = 0.1, test_fraction: float = 0.1
 ) -> pd.Series:
@@ -29,49 +41,37 @@ def _split_by_chromosome_auto(
     -------
         pd.Series: Series with the split assignment for each region.
     """
-    chrom_count = defaultdict(int)
-    for region in regions:
-        chrom = region.split(":")[0]
-        chrom_count[chrom] += 1
+    chroms = _get_chromosomes(regions)
 
-    total_regions = sum(chrom_count.values())
+    # Count regions per chromosome, keeping the order of first appearance
+    unique_chroms, first_indices, counts = np.unique(
+        chroms, return_index=True, return_counts=True
+    )
+    order = np.argsort(first_indices)
+    chromosomes = unique_chroms[order]
+    chrom_counts = counts[order]
+
+    total_regions = len(chroms)
     target_val_size = int(val_fraction * total_regions)
     target_test_size = int(test_fraction * total_regions)
 
-    chromosomes = list(chrom_count.keys())
-    np.random.shuffle(chromosomes)
-
-    val_chroms = set()
-    test_chroms = set()
-    current_val_size = 0
-    current_test_size = 0
-
-    for chrom in chromosomes:
-        if current_val_size < target_val_size:
-            val_chroms.add(chrom)
-            current_val_size += chrom_count[chrom]
-        elif current_test_size < target_test_size:
-            test_chroms.add(chrom)
-            current_test_size += chrom_count[chrom]
-        if (
-            current_val_size >= target_val_size
-            and current_test_size >= target_test_size
-        ):
-            break
-
-    indices = {"train": [], "val": [], "test": []}
-    for i, region in enumerate(regions):
-        chrom = region.split(":")[0]
-        if chrom in val_chroms:
-            indices["val"].append(i)
-        elif chrom in test_chroms:
-            indices["test"].append(i)
-        else:
-            indices["train"].append(i)
+    shuffled = np.arange(len(chromosomes))
+    np.random.shuffle(shuffled)
+    chromosomes = chromosomes[shuffled]
+    chrom_counts = chrom_counts[shuffled]
+
+    # Greedily take shuffled chromosomes until the val and then the test size is reached
+    n_val_chroms = _n_chroms_to_reach(chrom_counts, target_val_size)
+    n_test_chroms = _n_chroms_to_reach(chrom_counts[n_val_chroms:], target_test_size)
+    val_chroms = chromosomes[:n_val_chroms]
+    test_chroms = chromosomes[n_val_chroms : n_val_chroms + n_test_chroms]
+
+    val_mask = np.isin(chroms, val_chroms)
+    test_mask = np.isin(chroms, test_chroms)
 
     split = pd.Series("train", index=regions)
-    split.iloc[indices["val"]] = "val"
-    split.iloc[indices["test"]] = "test"
+    split.iloc[np.flatnonzero(val_mask)] = "val"
+    split.iloc[np.flatnonzero(test_mask)] = "test"
     return split
 
 
@@ -94,8 +94,8 @@ def _split_by_chromosome(
     -------
         pd.Series: Series with the split assignment for each region.
     """
-    indices = {"train": [], "val": [], "test": []}
-    all_chroms = {region.split(":")[0] for region in regions}
+    chroms = _get_chromosomes(regions)
+    all_chroms = set(chroms)
 
     if not set(val_chroms).issubset(all_chroms):
         raise ValueError("One or more val chromosomes not found in regions.")
@@ -106,28 +106,23 @@ def _split_by_chromosome(
     overlap_chroms = set(val_chroms) & set(test_chroms)
     val_chroms = set(val_chroms) - overlap_chroms
     test_chroms = set(test_chroms) - overlap_chroms
-    chrom_counter = {}
-
-    for i, region in enumerate(regions):
-        chrom = region.split(":")[0]
-        if chrom in overlap_chroms:
-            if chrom not in chrom_counter:
-                chrom_counter[chrom] = 0
-            if chrom_counter[chrom] % 2 == 0:
-                indices["val"].append(i)
-            else:
-                indices["test"].append(i)
-            chrom_counter[chrom] += 1
-        elif chrom in val_chroms:
-            indices["val"].append(i)
-        elif chrom in test_chroms:
-            indices["test"].append(i)
-        else:
-            indices["train"].append(i)
+
+    # Regions on chromosomes in both sets alternate between val and test
+    overlap_mask = np.isin(chroms, list(overlap_chroms))
+    overlap_rank = np.zeros(len(regions), dtype=np.int64)
+    overlap_rank[overlap_mask] = (
+        pd.Series(chroms[overlap_mask]).groupby(chroms[overlap_mask]).cumcount()
+    )
+    val_mask = np.isin(chroms, list(val_chroms)) | (
+        overlap_mask & (overlap_rank % 2 == 0)
+    )
+    test_mask = np.isin(chroms, list(test_chroms)) | (
+        overlap_mask & (overlap_rank % 2 == 1)
+    )
 
     split = pd.Series("train", index=regions)
-    split.iloc[indices["val"]] = "val"
-    split.iloc[indices["test"]] = "test"
+    split.iloc[np.flatnonzero(val_mask)] = "val"
+    split.iloc[np.flatnonzero(test_mask)] = "test"
     return split
 
 
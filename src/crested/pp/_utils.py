@@ -5,6 +5,31 @@ from __future__ import annotations
 import numpy as np
 
 
+def _calc_gini_scores(targets: np.ndarray) -> np.ndarray:
+    """
+    Return the Gini coefficient of each row in the targets array.
+
+    Parameters
+    ----------
+    targets
+        A 2D numpy array where each row represents a set of target values.
+
+    Returns
+    -------
+    gini scores
+        A 1D numpy array with the Gini score of each row in `targets`.
+    """
+    sorted_targets = (
+        targets.clip(0, None) + 0.0000001
+    )  # Ensure non-negative values and avoid zero
+    sorted_targets.sort(axis=1)
+    n_classes = sorted_targets.shape[1]
+    weights = (
+        np.arange(1, n_classes + 1, dtype=sorted_targets.dtype) * 2 - n_classes - 1
+    )
+    return (sorted_targets @ weights) / (n_classes * sorted_targets.sum(axis=1))
+
+
 def _calc_gini(targets: np.ndarray) -> np.ndarray:
     """
     Return Gini scores for the given targets.
@@ -24,24 +49,9 @@ def _calc_gini(targets: np.ndarray) -> np.ndarray:
         A 2D numpy array with the same shape as `targets` containing Gini scores,
         where each score is assigned to the position of the maximum value in each row.
     """
-
-    def _gini(array: np.ndarray) -> float:
-        """Calculate the Gini coefficient of a numpy array."""
-        array = (
-            array.flatten().clip(0, None) + 0.0000001
-        )  # Ensure non-negative values and avoid zero
-        array = np.sort(array)
-        index = np.arange(1, array.size + 1)
-        return (np.sum((2 * index - array.size - 1) * array)) / (
-            array.size * np.sum(array)
-        )
-
     gini_scores = np.zeros_like(targets)
-
-    for region_idx in range(targets.shape[0]):
-        region_scores = targets[region_idx]
-        max_idx = np.argmax(region_scores)
-        gini_scores[region_idx, max_idx] = _gini(region_scores)
+    max_idx = np.argmax(targets, axis=1)[:, None]
+    np.put_along_axis(gini_scores, max_idx, _calc_gini_scores(targets)[:, None], axis=1)
 
     return gini_scores
 
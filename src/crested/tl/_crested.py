@@ -23,12 +23,15 @@ from crested.utils import (
 )
 from crested.utils._logging import log_and_raise
 from crested.utils._utils import (
+    _one_hot_encode_sequences,
     _weighted_difference,
     generate_motif_insertions,
     generate_mutagenesis,
 )
 
 if os.environ["KERAS_BACKEND"] == "tensorflow":
+    import tensorflow as tf
+
     from crested.tl._explainer_tf import Explainer
 elif os.environ["KERAS_BACKEND"] == "torch":
     from crested.tl._explainer_torch import Explainer
@@ -241,6 +244,7 @@ class Crested:
         learning_rate_reduce_metric: str = "val_loss",
         learning_rate_reduce_mode: str = "min",
         custom_callbacks: list | None = None,
+        jit_compile: bool | str = "auto",
     ) -> None:
         """
         Fit the model on the training and validation set.
@@ -250,7 +254,10 @@ class Crested:
         epochs
             Number of epochs to train the model.
         mixed_precision
-            Enable mixed precision training.
+            Set the global keras policy to 'mixed_float16' before compiling.
+            This does not change the precision of the layers of an already built model, so it has
+            no effect on the model being trained. Build the model in mixed precision instead,
+            e.g. with the `mixed_precision` argument of the `crested.tl.zoo` models.
         model_checkpointing
             Save model checkpoints.
         model_checkpointing_best_only
@@ -277,6 +284,9 @@ class Crested:
             'max' if a high metric is better, 'min' if a low metric is better
         custom_callbacks
             List of custom callbacks to use during training.
+        jit_compile
+            Compile the train and evaluation steps with XLA, fusing the convolution, normalization and activation ops.
+            'auto' uses XLA whenever the backend and model support it.
         """
         self._check_fit_params()
 
@@ -305,7 +315,8 @@ class Crested:
 
         if mixed_precision:
             logger.warning(
-                "Mixed precision enabled. This can lead to faster training times but sometimes causes instable training. Disable on CPU or older GPUs."
+                "Mixed precision enabled. This only sets the global policy and does not change the layers of the already built model. "
+                "Build the model with the `mixed_precision` argument of the `crested.tl.zoo` models instead."
             )
             keras.mixed_precision.set_global_policy("mixed_float16")
 
@@ -313,6 +324,7 @@ class Crested:
             optimizer=self.config.optimizer,
             loss=self.config.loss,
             metrics=self.config.metrics,
+            jit_compile=jit_compile,
         )
 
         print(self.model.summary())
@@ -356,9 +368,19 @@ class Crested:
 
         try:
             if os.environ["KERAS_BACKEND"] == "tensorflow":
+                train_data = train_loader.data
+                val_data = val_loader.data
+                if tf.config.list_physical_devices("GPU"):
+                    # overlap the host to device copy of the next batch with the current step
+                    train_data = train_data.apply(
+                        tf.data.experimental.prefetch_to_device("/gpu:0")
+                    )
+                    val_data = val_data.apply(
+                        tf.data.experimental.prefetch_to_device("/gpu:0")
+                    )
                 self.model.fit(
-                    train_loader.data,
-                    validation_data=val_loader.data,
+                    train_data,
+                    validation_data=val_data,
                     epochs=epochs,
                     steps_per_epoch=n_train_steps_per_epoch,
                     validation_steps=n_val_steps_per_epoch,
@@ -663,17 +685,12 @@ class Crested:
         if isinstance(region_idx, str):
             region_idx = [region_idx]
 
-        all_predictions = []
-
-        for region in region_idx:
-            sequence = self.anndatamodule.predict_dataset.sequence_loader.get_sequence(
-                region
-            )
-            x = one_hot_encode_sequence(sequence)
-            predictions = self.model.predict(x)
-            all_predictions.append(predictions)
+        sequence_loader = self.anndatamodule.predict_dataset.sequence_loader
+        x = _one_hot_encode_sequences(
+            [sequence_loader.get_sequence(region) for region in region_idx]
+        )
 
-        return np.concatenate(all_predictions, axis=0)
+        return self.model.predict(x)
 
     def predict_sequence(self, sequence: str) -> np.ndarray:
         """
@@ -789,16 +806,13 @@ class Crested:
                 break
 
             # Fetch the sequence
-            seq = genome.fetch(chr_name, window_start, window_end).upper()
-
-            # One-hot encode the sequence (you would need to ensure this function is available)
-            seq_onehot = one_hot_encode_sequence(seq)
-
-            all_sequences.append(seq_onehot)
+            all_sequences.append(
+                genome.fetch(chr_name, window_start, window_end).upper()
+            )
             all_coordinates.append((chr_name, int(window_start), int(window_end)))
 
-        # Stack sequences for batch processing
-        all_sequences = np.squeeze(np.stack(all_sequences), axis=1)
+        # One-hot encode all windows at once for batch processing
+        all_sequences = _one_hot_encode_sequences(all_sequences)
 
         # Perform batched predictions
         predictions = self.model.predict(all_sequences, verbose=0)
@@ -1731,17 +1745,19 @@ class Crested:
         if self.acgt_distribution is None:
             self._calculate_location_gc_frequencies()
 
-        random_sequences = np.empty((n_sequences), dtype=object)
+        # Sample a nucleotide per location from the cumulative ACGT distribution
+        # and gather the corresponding ASCII codes
+        cumulative_distribution = np.cumsum(self.acgt_distribution[:seq_len], axis=1)
+        random_values = np.random.rand(n_sequences, seq_len, 1)
+        nucleotide_indices = np.minimum(
+            (random_values >= cumulative_distribution).sum(axis=2), 3
+        )
+        nucleotide_codes = np.frombuffer(b"ACGT", dtype=np.uint8)[nucleotide_indices]
 
-        for idx_seq in range(n_sequences):
-            current_sequence = []
-            for idx_loc in range(seq_len):
-                current_sequence.append(
-                    np.random.choice(
-                        ["A", "C", "G", "T"], p=list(self.acgt_distribution[idx_loc])
-                    )
-                )
-            random_sequences[idx_seq] = "".join(current_sequence)
+        random_sequences = np.empty((n_sequences), dtype=object)
+        random_sequences[:] = [
+            codes.tobytes().decode("ascii") for codes in nucleotide_codes
+        ]
 
         return random_sequences
 
@@ -1757,9 +1773,7 @@ class Crested:
         )
         all_sequences = list(sequence_loader.sequences.values())
         sequence_length = len(all_sequences[0])
-        all_onehot_squeeze = np.array(
-            [one_hot_encode_sequence(seq) for seq in all_sequences]
-        ).squeeze(axis=1)
+        all_onehot_squeeze = _one_hot_encode_sequences(all_sequences)
         acgt_distribution = np.sum(all_onehot_squeeze, axis=0).astype(int) / np.reshape(
             np.sum(np.sum(all_onehot_squeeze, axis=0), axis=1), (sequence_length, 1)
         ).astype(int)
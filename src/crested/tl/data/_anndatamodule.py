@@ -56,6 +56,14 @@ class AnnDataModule:
         If True, the data will be shuffled at the end of each epoch during training. Default is True.
     batch_size
         Number of samples per batch to load. Default is 256.
+    cache_val
+        If True, the validation samples are cached in memory after the first epoch (tensorflow backend only).
+        Saves reloading and encoding the validation sequences every epoch, at the cost of
+        keeping the one hot encoded validation set in memory. Default is False.
+    parallel_chromosomes
+        If True, the training samples of each chromosome are read by separate generators
+        that are interleaved in parallel (tensorflow backend only). Speeds up reading sequences
+        from the genome file, but each batch mixes samples from fewer chromosomes. Default is False.
     """
 
     def __init__(
@@ -70,6 +78,8 @@ class AnnDataModule:
         deterministic_shift: bool = False,
         shuffle: bool = True,
         batch_size: int = 256,
+        cache_val: bool = False,
+        parallel_chromosomes: bool = False,
     ):
         """Initialize the DataModule with the provided dataset and options."""
         self.adata = adata
@@ -82,6 +92,8 @@ class AnnDataModule:
         self.deterministic_shift = deterministic_shift
         self.shuffle = shuffle
         self.batch_size = batch_size
+        self.cache_val = cache_val
+        self.parallel_chromosomes = parallel_chromosomes
 
         self._validate_init_args(random_reverse_complement, always_reverse_complement)
         if (chromsizes_file is None) and (max_stochastic_shift > 0):
@@ -174,6 +186,7 @@ class AnnDataModule:
             batch_size=self.batch_size,
             shuffle=self.shuffle,
             drop_remainder=False,
+            parallel_chromosomes=self.parallel_chromosomes,
         )
 
     @property
@@ -186,6 +199,7 @@ class AnnDataModule:
             batch_size=self.batch_size,
             shuffle=False,
             drop_remainder=False,
+            cache=self.cache_val,
         )
 
     @property
@@ -220,5 +234,6 @@ class AnnDataModule:
             f"always_reverse_complement={self.always_reverse_complement}, "
             f"random_reverse_complement={self.random_reverse_complement}, "
             f"max_stochastic_shift={self.max_stochastic_shift}, shuffle={self.shuffle}, "
-            f"batch_size={self.batch_size}"
+            f"batch_size={self.batch_size}, cache_val={self.cache_val}, "
+            f"parallel_chromosomes={self.parallel_chromosomes}"
         )
@@ -4,6 +4,8 @@ from __future__ import annotations
 
 import os
 
+import numpy as np
+
 if os.environ["KERAS_BACKEND"] == "torch":
     import torch
     from torch.utils.data import DataLoader
@@ -27,6 +29,13 @@ class AnnDataLoader:
         Indicates whether shuffling is enabled.
     drop_remainder
         Indicates whether to drop the last incomplete batch.
+    cache
+        Cache the samples in memory after the first pass over the dataset.
+        Only used with the tensorflow backend and ignored if the dataset is shuffled or augmented randomly.
+    parallel_chromosomes
+        Read the samples of each chromosome with a separate generator and interleave them in parallel.
+        Only used with the tensorflow backend. The sample order is not deterministic and
+        each batch mixes samples from fewer chromosomes, so only use this for training.
 
     Examples
     --------
@@ -45,12 +54,16 @@ class AnnDataLoader:
         batch_size: int,
         shuffle: bool = False,
         drop_remainder: bool = True,
+        cache: bool = False,
+        parallel_chromosomes: bool = False,
     ):
         """Initialize the DataLoader with the provided dataset and options."""
         self.dataset = dataset
         self.batch_size = batch_size
         self.shuffle = shuffle
         self.drop_remainder = drop_remainder
+        self.cache = cache
+        self.parallel_chromosomes = parallel_chromosomes
         if os.environ["KERAS_BACKEND"] == "torch":
             self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
 
@@ -60,10 +73,8 @@ class AnnDataLoader:
     def _collate_fn(self, batch):
         """Collate function to move tensors to the specified device if backend is torch."""
         inputs, targets = zip(*batch)
-        inputs = torch.stack([torch.tensor(input) for input in inputs]).to(self.device)
-        targets = torch.stack([torch.tensor(target) for target in targets]).to(
-            self.device
-        )
+        inputs = torch.from_numpy(np.stack(inputs)).to(self.device)
+        targets = torch.from_numpy(np.stack(targets)).to(self.device)
         return inputs, targets
 
     def _create_dataset(self):
@@ -76,13 +87,28 @@ class AnnDataLoader:
                 collate_fn=self._collate_fn,
             )
         elif os.environ["KERAS_BACKEND"] == "tensorflow":
-            ds = tf.data.Dataset.from_generator(
-                self.dataset,
-                output_signature=(
-                    tf.TensorSpec(shape=(self.dataset.seq_len, 4), dtype=tf.float32),
-                    tf.TensorSpec(shape=(self.dataset.num_outputs,), dtype=tf.float32),
-                ),
+            output_signature = (
+                tf.TensorSpec(shape=(self.dataset.seq_len, 4), dtype=tf.float32),
+                tf.TensorSpec(shape=(self.dataset.num_outputs,), dtype=tf.float32),
             )
+            if self.parallel_chromosomes:
+                shards = tf.data.Dataset.range(len(self.dataset.chromosome_shards))
+                ds = shards.interleave(
+                    lambda shard: tf.data.Dataset.from_generator(
+                        self.dataset.shard_generator,
+                        args=(shard,),
+                        output_signature=output_signature,
+                    ),
+                    cycle_length=tf.data.AUTOTUNE,
+                    num_parallel_calls=tf.data.AUTOTUNE,
+                    deterministic=False,
+                )
+            else:
+                ds = tf.data.Dataset.from_generator(
+                    self.dataset, output_signature=output_signature
+                )
+            if self.cache and self._is_deterministic():
+                ds = ds.cache()
             ds = (
                 ds.batch(self.batch_size, drop_remainder=self.drop_remainder)
                 .repeat()
@@ -90,6 +116,15 @@ class AnnDataLoader:
             )
             return ds
 
+    def _is_deterministic(self) -> bool:
+        """Check if every pass over the dataset yields the same samples in the same order."""
+        return not (
+            self.shuffle
+            or self.parallel_chromosomes
+            or self.dataset.random_reverse_complement
+            or self.dataset.max_stochastic_shift > 0
+        )
+
     @property
     def data(self):
         """Return the dataset as a tf.data.Dataset instance."""
@@ -103,5 +138,6 @@ class AnnDataLoader:
         """Return the string representation of the DataLoader."""
         return (
             f"AnnDataLoader(dataset={self.dataset}, batch_size={self.batch_size}, "
-            f"shuffle={self.shuffle}, drop_remainder={self.drop_remainder})"
+            f"shuffle={self.shuffle}, drop_remainder={self.drop_remainder}, "
+            f"cache={self.cache}, parallel_chromosomes={self.parallel_chromosomes})"
         )
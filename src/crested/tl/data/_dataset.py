@@ -3,6 +3,8 @@
 from __future__ import annotations
 
 import os
+import threading
+from functools import cached_property
 from os import PathLike
 
 import numpy as np
@@ -41,7 +43,8 @@ class SequenceLoader:
         If True, the sequences of supplied regions will be loaded into memory.
     always_reverse_complement
         If True, all sequences will be augmented with their reverse complement.
-        Doubles the dataset size.
+        Doubles the dataset size. Reverse complements are computed on the fly,
+        so they do not double the memory usage when the sequences are in memory.
     max_stochastic_shift
         Maximum stochastic shift (n base pairs) to apply randomly to each sequence.
     regions
@@ -58,7 +61,8 @@ class SequenceLoader:
         regions: list[str] | None = None,
     ):
         """Initialize the SequenceLoader with the provided genome file and options."""
-        self.genome = FastaFile(genome_file)
+        self.genome_file = genome_file
+        self._local = threading.local()
         self.chromsizes = chromsizes
         self.in_memory = in_memory
         self.always_reverse_complement = always_reverse_complement
@@ -69,22 +73,22 @@ class SequenceLoader:
         if self.in_memory:
             self._load_sequences_into_memory(self.regions)
 
+    @property
+    def genome(self) -> FastaFile:
+        """Genome file handle, opened lazily once per thread since pysam handles are not thread safe."""
+        genome = getattr(self._local, "genome", None)
+        if genome is None:
+            genome = self._local.genome = FastaFile(self.genome_file)
+        return genome
+
     def _load_sequences_into_memory(self, regions: list[str]):
         """Load all sequences into memory (dict)."""
         logger.info("Loading sequences into memory...")
         for region in tqdm(regions):
-            extended_sequence = self._get_extended_sequence(region)
-            self.sequences[f"{region}:+"] = extended_sequence
-            if self.always_reverse_complement:
-                self.sequences[f"{region}:-"] = self._reverse_complement(
-                    extended_sequence
-                )
-
-    def _get_extended_sequence(self, region: str) -> str:
-        """Get sequence from genome file, extended for stochastic shifting."""
-        chrom, start_end = region.split(":")
-        start, end = map(int, start_end.split("-"))
+            self.sequences[region] = self._get_extended_sequence(region)
 
+    def _get_extended_bounds(self, chrom: str, start: int, end: int) -> tuple[int, int]:
+        """Get the start and end of a region extended for stochastic shifting."""
         extended_start = max(0, start - self.max_stochastic_shift)
         extended_end = extended_start + (end - start) + (self.max_stochastic_shift * 2)
 
@@ -95,7 +99,13 @@ class SequenceLoader:
                     end - start + self.max_stochastic_shift * 2
                 )
                 extended_end = chrom_size
+        return extended_start, extended_end
 
+    def _get_extended_sequence(self, region: str) -> str:
+        """Get sequence from genome file, extended for stochastic shifting."""
+        chrom, start_end = region.split(":")
+        start, end = map(int, start_end.split("-"))
+        extended_start, extended_end = self._get_extended_bounds(chrom, start, end)
         return self.genome.fetch(chrom, extended_start, extended_end).upper()
 
     def _reverse_complement(self, sequence: str) -> str:
@@ -104,25 +114,25 @@ class SequenceLoader:
 
     def get_sequence(self, region: str, strand: str = "+", shift: int = 0) -> str:
         """Get sequence for a region, strand, and shift from memory or fasta."""
-        key = f"{region}:{strand}"
         if self.in_memory:
-            sequence = self.sequences[key]
+            sequence = self.sequences[region]
         else:
             sequence = self._get_extended_sequence(region)
         chrom, start_end = region.split(":")
         start, end = map(int, start_end.split("-"))
-        start_idx = self.max_stochastic_shift + shift
+        extended_start, _ = self._get_extended_bounds(chrom, start, end)
+        start_idx = start + shift - extended_start
         end_idx = start_idx + (end - start)
         sub_sequence = sequence[start_idx:end_idx]
 
-        # handle reverse complement on the go if not loaded into memory
-        if (strand == "-") and (not self.in_memory):
-            sub_sequence = self._reverse_complement(sub_sequence)
-
-        # pad with Ns if sequence is shorter than expected
+        # pad with Ns if sequence is shorter than expected (runs past the chromosome end)
         if len(sub_sequence) < (end - start):
             sub_sequence = sub_sequence.ljust(end - start, "N")
 
+        # handle reverse complement on the go
+        if strand == "-":
+            sub_sequence = self._reverse_complement(sub_sequence)
+
         return sub_sequence
 
 
@@ -249,17 +259,22 @@ class AnnDataset(BaseClass):
         deterministic_shift: bool = False,
     ):
         """Initialize the dataset with the provided AnnData object and options."""
-        self.anndata = self._split_anndata(anndata, split)
+        subset = self._split_anndata(anndata, split)
         self.split = split
-        self.indices = list(self.anndata.var_names)
+        self.indices = list(subset.var_names)
         self.in_memory = in_memory
-        self.compressed = isinstance(self.anndata.X, spmatrix)
+        self.compressed = isinstance(subset.X, spmatrix)
+        self.targets = self._get_targets_per_region(subset.X)
+        # targets hold the only copy of X, keep the annotations without it
+        self.anndata = AnnData(obs=subset.obs.copy(), var=subset.var.copy())
         self.chromsizes = _read_chromsizes(chromsizes_file) if chromsizes_file else None
         self.index_map = {index: i for i, index in enumerate(self.indices)}
-        self.num_outputs = self.anndata.X.shape[0]
+        self.num_outputs = subset.shape[0]
         self.random_reverse_complement = random_reverse_complement
         self.max_stochastic_shift = max_stochastic_shift
         self.shuffle = False  # managed by subclass AnnDataLoader
+        self._shift_draws = np.empty(0)
+        self._shift_idx = 0
 
         self.sequence_loader = SequenceLoader(
             genome_file,
@@ -275,57 +290,108 @@ class AnnDataset(BaseClass):
             deterministic_shift=deterministic_shift,
         )
         self.seq_len = len(self.sequence_loader.get_sequence(self.indices[0]))
+        self._shift_low, self._shift_high = self._get_shift_bounds()
 
     @staticmethod
     def _split_anndata(anndata: AnnData, split: str) -> AnnData:
-        """Return subset of anndata based on a given split column."""
+        """Return a view of anndata subset on a given split column."""
         if split:
             if "split" not in anndata.var.columns:
                 raise KeyError(
                     "No split column found in anndata.var. Run `pp.train_val_test_split` first."
                 )
-        subset = (
-            anndata[:, anndata.var["split"] == split].copy()
-            if split
-            else anndata.copy()
-        )
-        return subset
+        return anndata[:, anndata.var["split"] == split] if split else anndata
 
     def __len__(self) -> int:
         """Get number of (augmented) samples in the dataset."""
         return len(self.index_manager.augmented_indices)
 
+    @staticmethod
+    def _get_targets_per_region(X: np.ndarray | spmatrix) -> np.ndarray | spmatrix:
+        """Transpose the (classes, regions) matrix once so that each region's targets are a contiguous float32 row."""
+        if isinstance(X, spmatrix):
+            return X.T.tocsr().astype(np.float32)
+        return np.ascontiguousarray(X.T, dtype=np.float32)
+
     def _get_target(self, index: str) -> np.ndarray:
         """Get target for a given index."""
         y_index = self.index_map[index]
         return (
-            self.anndata.X[:, y_index].toarray().flatten()
+            self.targets[y_index].toarray().flatten()
             if self.compressed
-            else self.anndata.X[:, y_index]
+            else self.targets[y_index]
         )
 
+    def _get_shift_bounds(self) -> tuple[list[int], list[int]]:
+        """Get the minimum and maximum stochastic shift per region that keep the region within its chromosome."""
+        regions = pd.Series(self.indices).str.extract(r"^(.+):(\d+)-(\d+)$")
+        starts = regions[1].to_numpy(dtype=np.int64)
+        ends = regions[2].to_numpy(dtype=np.int64)
+        if self.chromsizes:
+            chromsizes = regions[0].map(self.chromsizes).to_numpy(dtype=np.float64)
+            # chromosomes without a size are only bounded by the maximum shift
+            space_after = np.nan_to_num(
+                chromsizes - ends, nan=self.max_stochastic_shift
+            )
+        else:
+            space_after = np.full(len(ends), self.max_stochastic_shift)
+        low = -np.clip(starts, 0, self.max_stochastic_shift)
+        high = np.clip(space_after, 0, self.max_stochastic_shift).astype(np.int64)
+        return low.tolist(), high.tolist()
+
+    def _draw_shift(self, block_size: int = 4096) -> float:
+        """Draw a uniform [0, 1) value to pick a stochastic shift, generating them in blocks to avoid a numpy call per sample."""
+        if self._shift_idx >= len(self._shift_draws):
+            self._shift_draws = np.random.random(block_size)
+            self._shift_idx = 0
+        draw = float(self._shift_draws[self._shift_idx])
+        self._shift_idx += 1
+        return draw
+
+    @cached_property
+    def chromosome_shards(self) -> list[np.ndarray]:
+        """
+        Augmented indices grouped per chromosome, in order of first appearance.
+
+        Built from the augmented indices map rather than the (in place shuffled) augmented
+        indices list, so the shards stay valid when the dataset is also iterated with `__call__`.
+        """
+        augmented_indices = pd.Series(list(self.index_manager.augmented_indices_map))
+        codes, _ = pd.factorize(augmented_indices.str.partition(":")[0])
+        order = np.argsort(codes, kind="stable")
+        shards = np.split(order, np.flatnonzero(np.diff(codes[order])) + 1)
+        return [augmented_indices.to_numpy()[shard] for shard in shards]
+
     def __getitem__(self, idx: int) -> tuple[str, np.ndarray]:
         """Return sequence and target for a given index."""
-        augmented_index = self.index_manager.augmented_indices[idx]
+        shift_draw = self._draw_shift() if self.max_stochastic_shift > 0 else 0.0
+        return self._get_sample(self.index_manager.augmented_indices[idx], shift_draw)
+
+    def _get_sample(
+        self, augmented_index: str, shift_draw: float = 0.0
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Return sequence and target for a given augmented index, with a stochastic shift picked by a uniform [0, 1) draw."""
         original_index = self.index_manager.augmented_indices_map[augmented_index]
 
         strand = "-" if augmented_index.endswith(":-") else "+"
 
-        # stochastic shift
+        # stochastic shift, uniform over the shifts that stay within the chromosome
+        shift = 0
         if self.max_stochastic_shift > 0:
-            shift = np.random.randint(
-                -self.max_stochastic_shift, self.max_stochastic_shift + 1
-            )
-            x = self.sequence_loader.get_sequence(original_index, strand, shift)
-        else:
-            x = self.sequence_loader.get_sequence(original_index, strand)
+            region_idx = self.index_map[original_index]
+            low = self._shift_low[region_idx]
+            high = self._shift_high[region_idx]
+            shift = low + int(shift_draw * (high - low + 1))
+        x = self.sequence_loader.get_sequence(original_index, strand, shift)
+
+        # one hot encode sequence and convert to numpy array
+        x = one_hot_encode_sequence(x, expand_dim=False)
 
         # random reverse complement (always is done in the sequence loader)
+        # with ACGT columns, reversing both axes of the one hot encoding is the reverse complement
         if self.random_reverse_complement and np.random.rand() < 0.5:
-            x = self.sequence_loader._reverse_complement(x)
+            x = x[::-1, ::-1]
 
-        # one hot encode sequence and convert to numpy array
-        x = one_hot_encode_sequence(x, expand_dim=False)
         y = self._get_target(original_index)
 
         return x, y
@@ -338,6 +404,21 @@ class AnnDataset(BaseClass):
                     self.index_manager.shuffle_indices()
             yield self.__getitem__(i)
 
+    def shard_generator(self, shard: int):
+        """
+        Call generator for the samples of a single chromosome shard.
+
+        Shards are shuffled and shifted independently, so that they can be read in parallel.
+        """
+        augmented_indices = self.chromosome_shards[shard]
+        if self.shuffle:
+            augmented_indices = np.random.permutation(augmented_indices)
+        shift_draws = np.random.random(len(augmented_indices))
+        for augmented_index, shift_draw in zip(
+            augmented_indices.tolist(), shift_draws.tolist()
+        ):
+            yield self._get_sample(augmented_index, shift_draw)
+
     def __repr__(self) -> str:
         """Get string representation of the dataset."""
         return f"AnnDataset(anndata_shape={self.anndata.shape}, n_samples={len(self)}, num_outputs={self.num_outputs}, split={self.split}, in_memory={self.in_memory})"
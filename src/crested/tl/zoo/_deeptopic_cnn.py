@@ -1,8 +1,10 @@
 """Deeptopic CNN model architecture."""
 
+from __future__ import annotations
+
 import keras
 
-from crested.tl.zoo.utils import conv_block, dense_block
+from crested.tl.zoo.utils import conv_block, dense_block, precision_policy
 
 
 def deeptopic_cnn(
@@ -20,6 +22,7 @@ def deeptopic_cnn(
     pre_dense_do: float = 0.5,
     first_kernel_l2: float = 1e-4,
     kernel_l2: float = 1e-5,
+    mixed_precision: str | None = None,
 ) -> keras.Model:
     """
     Construct a DeepTopicCNN model. Usually used for topic classification.
@@ -55,86 +58,72 @@ def deeptopic_cnn(
         L2 regularization for the first convolutional layer.
     kernel_l2
         L2 regularization for the other convolutional layers.
+    mixed_precision
+        Keras mixed precision policy to build the model with ('mixed_float16' or 'mixed_bfloat16').
+        Roughly doubles the throughput on GPUs with tensor cores (use 'mixed_bfloat16' on Ampere or newer GPUs and TPUs).
+        The output layer is always kept in float32 for numerical stability. If None, the global policy is used.
+        This is the setting that determines the precision of the model's layers; `Crested.fit(mixed_precision=True)`
+        only changes the global policy after the model is built and does not affect them.
 
     Returns
     -------
     A Keras model.
     """
-    inputs = keras.layers.Input(shape=(seq_len, 4), name="sequence")
+    with precision_policy(mixed_precision):
+        inputs = keras.layers.Input(shape=(seq_len, 4), name="sequence")
 
-    x = conv_block(
-        inputs,
-        filters=filters,
-        kernel_size=first_kernel_size,
-        pool_size=pool_size,
-        activation=first_activation,
-        dropout=conv_do,
-        conv_bias=False,
-        normalization=normalization,
-        res=False,
-        padding="same",
-        l2=first_kernel_l2,
-        batchnorm_momentum=0.9,
-    )
-    # conv blocks without residual connections
-    for _ in range(2):
         x = conv_block(
-            x,
-            filters=int(filters / 2),
-            kernel_size=11,
+            inputs,
+            filters=filters,
+            kernel_size=first_kernel_size,
             pool_size=pool_size,
-            activation=activation,
+            activation=first_activation,
             dropout=conv_do,
             conv_bias=False,
             normalization=normalization,
             res=False,
             padding="same",
-            l2=kernel_l2,
+            l2=first_kernel_l2,
             batchnorm_momentum=0.9,
         )
+        # (kernel_size, pool_size, dropout, residual) of the blocks after the first,
+        # the first two without and the last two with residual connections
+        block_configs = (
+            (11, pool_size, conv_do, False),
+            (11, pool_size, conv_do, False),
+            (5, pool_size, conv_do, True),
+            (2, 0, 0, True),  # no pooling
+        )
+        half_filters = filters // 2
+        for kernel_size, block_pool_size, dropout, res in block_configs:
+            x = conv_block(
+                x,
+                filters=half_filters,
+                kernel_size=kernel_size,
+                pool_size=block_pool_size,
+                activation=activation,
+                dropout=dropout,
+                conv_bias=False,
+                normalization=normalization,
+                res=res,
+                padding="same",
+                l2=kernel_l2,
+                batchnorm_momentum=0.9,
+            )
 
-    # conv blocks with residual connections
-    x = conv_block(
-        x,
-        filters=int(filters / 2),
-        kernel_size=5,
-        pool_size=pool_size,
-        activation=activation,
-        dropout=conv_do,
-        conv_bias=False,
-        normalization=normalization,
-        res=True,
-        padding="same",
-        l2=kernel_l2,
-        batchnorm_momentum=0.9,
-    )
-
-    x = conv_block(
-        x,
-        filters=int(filters / 2),
-        kernel_size=2,
-        pool_size=0,  # no pooling
-        activation=activation,
-        dropout=0,
-        normalization=normalization,
-        conv_bias=False,
-        res=True,
-        padding="same",
-        l2=kernel_l2,
-        batchnorm_momentum=0.9,
-    )
-
-    x = keras.layers.Flatten()(x)
-    x = keras.layers.Dropout(pre_dense_do)(x)
-    x = dense_block(
-        x,
-        dense_out,
-        activation,
-        dropout=dense_do,
-        normalization=normalization,
-        name_prefix="denseblock",
-        use_bias=False,
-    )
-    logits = keras.layers.Dense(num_classes, activation="linear", use_bias=True)(x)
-    outputs = keras.layers.Activation("sigmoid")(logits)
-    return keras.Model(inputs=inputs, outputs=outputs)
+        x = keras.layers.Flatten()(x)
+        x = keras.layers.Dropout(pre_dense_do)(x)
+        x = dense_block(
+            x,
+            dense_out,
+            activation,
+            dropout=dense_do,
+            normalization=normalization,
+            name_prefix="denseblock",
+            use_bias=False,
+        )
+        logits = keras.layers.Dense(
+            num_classes, activation="linear", use_bias=True, dtype="float32"
+        )(x)
+        outputs = keras.layers.Activation("sigmoid", dtype="float32")(logits)
+        return keras.Model(inputs=inputs, outputs=outputs)
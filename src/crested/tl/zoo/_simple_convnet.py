@@ -1,8 +1,10 @@
 """Simple convnet model architecture."""
 
+from __future__ import annotations
+
 import keras
 
-from crested.tl.zoo.utils import conv_block, dense_block
+from crested.tl.zoo.utils import conv_block, dense_block, precision_policy
 
 
 def simple_convnet(
@@ -26,6 +28,7 @@ def simple_convnet(
     flatten: bool = True,
     dense_size: int = 256,
     bottleneck: int = 8,
+    mixed_precision: str | None = None,
 ) -> keras.Model:
     """
     Construct a Simple ConvNet with standard convolutional and dense blocks.
@@ -74,61 +77,68 @@ def simple_convnet(
         Number of neurons in the dense layers.
     bottleneck
         Size of the bottleneck layer.
+    mixed_precision
+        Keras mixed precision policy to build the model with ('mixed_float16' or 'mixed_bfloat16').
+        Roughly doubles the throughput on GPUs with tensor cores (use 'mixed_bfloat16' on Ampere or newer GPUs and TPUs).
+        The output layer is always kept in float32 for numerical stability. If None, the global policy is used.
+        This is the setting that determines the precision of the model's layers; `Crested.fit(mixed_precision=True)`
+        only changes the global policy after the model is built and does not affect them.
 
     Returns
     -------
     A Keras model.
     """
-    inputs = keras.layers.Input(shape=(seq_len, 4), name="sequence")
+    with precision_policy(mixed_precision):
+        inputs = keras.layers.Input(shape=(seq_len, 4), name="sequence")
+
+        x = conv_block(
+            inputs,
+            filters=first_filters,
+            kernel_size=first_kernel_size,
+            pool_size=first_pool_size,
+            activation=first_activation,
+            dropout=conv_dropout,
+            normalization=normalization,
+            res=residual,
+        )
 
-    x = conv_block(
-        inputs,
-        filters=first_filters,
-        kernel_size=first_kernel_size,
-        pool_size=first_pool_size,
-        activation=first_activation,
-        dropout=conv_dropout,
-        normalization=normalization,
-        res=residual,
-    )
+        if num_conv_blocks > 1:
+            for i in range(1, num_conv_blocks):
+                x = conv_block(
+                    x,
+                    filters=i * filters,
+                    kernel_size=kernel_size,
+                    pool_size=pool_size,
+                    activation=activation,
+                    dropout=i * conv_dropout,
+                    normalization=normalization,
+                    res=residual,
+                )
 
-    if num_conv_blocks > 1:
-        for i in range(1, num_conv_blocks):
-            x = conv_block(
+        if flatten:
+            x = keras.layers.Flatten()(x)
+        else:
+            x = keras.layers.GlobalAveragePooling1D()(x)
+
+        for _ in range(1, num_dense_blocks):
+            x = dense_block(
                 x,
-                filters=i * filters,
-                kernel_size=kernel_size,
-                pool_size=pool_size,
-                activation=activation,
-                dropout=i * conv_dropout,
+                dense_size,
+                activation,
+                dropout=dense_dropout,
                 normalization=normalization,
-                res=residual,
             )
 
-    if flatten:
-        x = keras.layers.Flatten()(x)
-    else:
-        x = keras.layers.GlobalAveragePooling1D()(x)
-
-    for _ in range(1, num_dense_blocks):
         x = dense_block(
             x,
-            dense_size,
+            bottleneck,
             activation,
             dropout=dense_dropout,
             normalization=normalization,
+            name_prefix="denseblock",
         )
 
-    x = dense_block(
-        x,
-        bottleneck,
-        activation,
-        dropout=dense_dropout,
-        normalization=normalization,
-        name_prefix="denseblock",
-    )
-
-    outputs = keras.layers.Dense(
-        num_classes, activation=output_activation, name="dense_out"
-    )(x)
-    return keras.Model(inputs=inputs, outputs=outputs)
+        outputs = keras.layers.Dense(
+            num_classes, activation=output_activation, name="dense_out", dtype="float32"
+        )(x)
+        return keras.Model(inputs=inputs, outputs=outputs)
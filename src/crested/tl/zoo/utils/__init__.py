@@ -1,3 +1,4 @@
 """Init file for the utils module."""
 
 from ._layers import *  # noqa: F403
+from ._precision import precision_policy
@@ -0,0 +1,35 @@
+"""Helpers for building zoo models in (mixed) precision."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+import keras
+
+__all__ = ["precision_policy"]
+
+
+@contextmanager
+def precision_policy(policy: str | None = None) -> Iterator[None]:
+    """
+    Temporarily set the global keras dtype policy while building a model.
+
+    Layers keep the policy they were created with, so the model stays in the requested
+    precision while the global policy is restored for models built afterwards.
+
+    Parameters
+    ----------
+    policy
+        Keras dtype policy name, e.g. 'mixed_float16' or 'mixed_bfloat16'.
+        If None, the current global policy is used.
+    """
+    if policy is None:
+        yield
+        return
+    previous_policy = keras.mixed_precision.global_policy()
+    keras.mixed_precision.set_global_policy(policy)
+    try:
+        yield
+    finally:
+        keras.mixed_precision.set_global_policy(previous_policy)
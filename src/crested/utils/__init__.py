@@ -1,7 +1,7 @@
 """Import all utility functions and classes."""
 
 from ._logging import setup_logging
-from ._model_utils import permute_model
+from ._model_utils import fold_batchnorm, permute_model
 from ._utils import (
     EnhancerOptimizer,
     extract_bigwig_values_per_bp,
@@ -1,6 +1,7 @@
 """Utility functions for models."""
 
 import keras
+import numpy as np
 
 
 def permute_model(
@@ -37,3 +38,101 @@ def permute_model(
     new_model = keras.models.Model(inputs=new_input, outputs=output)
 
     return new_model
+
+
+@keras.utils.register_keras_serializable(package="Layers")
+class _FoldedBatchNormalization(keras.layers.Layer):
+    """Identity layer replacing a BatchNormalization layer that was folded into the preceding layer."""
+
+    def call(self, inputs, mask=None, training=None):
+        """Return the inputs unchanged."""
+        return inputs
+
+
+def _get_foldable_batchnorms(
+    model: keras.models.Model,
+) -> dict[str, keras.layers.BatchNormalization]:
+    """Map the names of linear Conv1D/Dense layers that only feed into a BatchNormalization layer to that layer."""
+    conv_to_bn = {}
+    for layer in model.layers:
+        if not isinstance(layer, keras.layers.BatchNormalization):
+            continue
+        if len(layer._inbound_nodes) != 1 or layer.axis not in (-1, 2):
+            continue
+        parent = layer._inbound_nodes[0].input_tensors[0]._keras_history.operation
+        if (
+            isinstance(parent, (keras.layers.Conv1D, keras.layers.Dense))
+            and parent.activation is keras.activations.linear
+            and getattr(parent, "data_format", "channels_last") == "channels_last"
+            and len(parent._inbound_nodes) == 1
+            and len(parent._outbound_nodes) == 1
+        ):
+            conv_to_bn[parent.name] = layer
+    return conv_to_bn
+
+
+def fold_batchnorm(model: keras.models.Model) -> keras.models.Model:
+    """
+    Fold BatchNormalization layers into the Conv1D or Dense layers without activation they directly follow.
+
+    The kernel is scaled by gamma / sqrt(var + eps) and the normalization is merged into its bias,
+    after which the batch normalization layer is replaced by an identity layer.
+    This saves reading and writing the full activation tensor once per folded layer during inference.
+    The predictions are unchanged, but since the batch statistics are no longer used, the folded model should only be used for inference.
+
+    Parameters
+    ----------
+    model
+        The (functional) keras model to fold.
+
+    Returns
+    -------
+    A new model with the batch normalization layers folded into the preceding layers.
+
+    Example
+    -------
+    >>> inference_model = crested.utils.fold_batchnorm(model)
+    >>> predictions = inference_model.predict(x)
+    """
+    conv_to_bn = _get_foldable_batchnorms(model)
+    folded_bns = {bn.name for bn in conv_to_bn.values()}
+
+    def _clone_layer(layer):
+        if layer.name in folded_bns:
+            return _FoldedBatchNormalization(name=layer.name)
+        config = layer.get_config()
+        if layer.name in conv_to_bn:
+            config["use_bias"] = True
+        return layer.__class__.from_config(config)
+
+    folded_model = keras.models.clone_model(model, clone_function=_clone_layer)
+
+    for layer in model.layers:
+        # unnamed inputs are renamed when cloning, and have no weights anyway
+        if layer.name in folded_bns or isinstance(layer, keras.layers.InputLayer):
+            continue
+        folded_layer = folded_model.get_layer(layer.name)
+        if layer.name not in conv_to_bn:
+            folded_layer.set_weights(layer.get_weights())
+            continue
+
+        bn = conv_to_bn[layer.name]
+        kernel = keras.ops.convert_to_numpy(layer.kernel)
+        bias = (
+            keras.ops.convert_to_numpy(layer.bias)
+            if layer.use_bias
+            else np.zeros(kernel.shape[-1], dtype=kernel.dtype)
+        )
+        mean = keras.ops.convert_to_numpy(bn.moving_mean)
+        variance = keras.ops.convert_to_numpy(bn.moving_variance)
+        gamma = keras.ops.convert_to_numpy(bn.gamma) if bn.scale else 1.0
+        beta = keras.ops.convert_to_numpy(bn.beta) if bn.center else 0.0
+        scale = gamma / np.sqrt(variance + bn.epsilon)
+        folded_layer.set_weights(
+            [
+                (kernel * scale).astype(kernel.dtype),
+                (beta + (bias - mean) * scale).astype(kernel.dtype),
+            ]
+        )
+
+    return folded_model
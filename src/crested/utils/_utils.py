@@ -74,6 +74,17 @@ def one_hot_encode_sequence(sequence: str, expand_dim: bool = True) -> np.ndarra
         ]
 
 
+def _one_hot_encode_sequences(sequences: list[str]) -> np.ndarray:
+    """One hot encode a list of equally long DNA sequences to an array of shape (N, L, 4)."""
+    seq_len = len(sequences[0])
+    if any(len(sequence) != seq_len for sequence in sequences):
+        raise ValueError("All sequences should have the same length.")
+    one_hot = HOT_ENCODING_TABLE[
+        np.frombuffer("".join(sequences).encode("ascii"), dtype=np.uint8)
+    ]
+    return one_hot.reshape(len(sequences), seq_len, HOT_ENCODING_TABLE.shape[1])
+
+
 def generate_mutagenesis(x, include_original=True, flanks=(0, 0)):
     """Generate all possible single point mutations in a sequence."""
     _, L, A = x.shape
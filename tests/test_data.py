@@ -0,0 +1,181 @@
+import itertools
+import os
+
+import numpy as np
+import pytest
+from pysam import FastaFile
+
+from crested.tl.data import AnnDataLoader
+from crested.tl.data._dataset import AnnDataset, SequenceLoader
+from crested.utils import one_hot_encode_sequence
+from tests._utils import create_anndata_with_regions
+
+GENOME_FILE = "tests/data/test_genome/genome.fa"
+CHROMSIZES_FILE = "tests/data/test_genome/genome.chrom.sizes"
+
+COMPLEMENT = str.maketrans("ACGT", "TGCA")
+
+
+def _genome_slice(chrom, start, end):
+    with FastaFile(GENOME_FILE) as genome:
+        return genome.fetch(chrom, start, end).upper()
+
+
+def _reverse_complement(sequence):
+    return sequence.translate(COMPLEMENT)[::-1]
+
+
+@pytest.mark.parametrize("in_memory", [True, False])
+def test_sequence_loader_pads_before_reverse_complement(in_memory):
+    region = "chr2:4800-5000"
+    loader = SequenceLoader(
+        GENOME_FILE,
+        chromsizes=None,
+        in_memory=in_memory,
+        always_reverse_complement=True,
+        max_stochastic_shift=30,
+        regions=[region],
+    )
+    forward = _genome_slice("chr2", 4830, 5000) + "N" * 30
+
+    assert loader.get_sequence(region, "+", shift=30) == forward
+    assert loader.get_sequence(region, "-", shift=30) == _reverse_complement(forward)
+
+
+REGIONS = ["chr1:10-210", "chr1:1000-1200", "chr2:4780-4980", "chr2:4800-5000"]
+
+
+@pytest.fixture(scope="module")
+def regions_adata():
+    return create_anndata_with_regions(REGIONS, n_classes=3, random_state=0)
+
+
+def test_anndataset_shift_bounds_clipped_to_chromosomes(regions_adata):
+    dataset = AnnDataset(
+        regions_adata,
+        GENOME_FILE,
+        chromsizes_file=CHROMSIZES_FILE,
+        in_memory=False,
+        max_stochastic_shift=50,
+    )
+
+    assert dataset._shift_low == [-10, -50, -50, -50]
+    assert dataset._shift_high == [50, 50, 20, 0]
+
+
+@pytest.mark.parametrize("in_memory", [True, False])
+def test_anndataset_shifted_sample_matches_genome(regions_adata, in_memory):
+    dataset = AnnDataset(
+        regions_adata,
+        GENOME_FILE,
+        chromsizes_file=CHROMSIZES_FILE,
+        in_memory=in_memory,
+        max_stochastic_shift=50,
+    )
+
+    for idx, region in enumerate(REGIONS):
+        chrom, start_end = region.split(":")
+        start, end = map(int, start_end.split("-"))
+        low, high = dataset._shift_low[idx], dataset._shift_high[idx]
+        for shift_draw in [0.0, 0.5, 0.999]:
+            shift = low + int(shift_draw * (high - low + 1))
+            x, y = dataset._get_sample(f"{region}:+", shift_draw)
+            expected = _genome_slice(chrom, start + shift, end + shift)
+            np.testing.assert_array_equal(
+                x, one_hot_encode_sequence(expected, expand_dim=False)
+            )
+            np.testing.assert_array_equal(y, regions_adata.X[:, idx].astype(np.float32))
+
+
+def _one_epoch(loader):
+    samples = []
+    for x, y in itertools.islice(loader.data, len(loader)):
+        samples.extend(zip(np.asarray(x), np.asarray(y)))
+    return samples
+
+
+@pytest.mark.skipif(
+    os.environ["KERAS_BACKEND"] != "tensorflow",
+    reason="parallel_chromosomes is only used with the tensorflow backend",
+)
+def test_anndataloader_parallel_chromosomes_epoch(regions_adata):
+    dataset = AnnDataset(
+        regions_adata,
+        GENOME_FILE,
+        chromsizes_file=CHROMSIZES_FILE,
+        in_memory=False,
+        always_reverse_complement=True,
+    )
+    # shuffle the augmented indices in place first, the shards should not depend on it
+    _one_epoch(AnnDataLoader(dataset, batch_size=3, shuffle=True, drop_remainder=False))
+    loader = AnnDataLoader(
+        dataset,
+        batch_size=3,
+        shuffle=True,
+        drop_remainder=False,
+        parallel_chromosomes=True,
+    )
+    samples = _one_epoch(loader)
+
+    for shard in dataset.chromosome_shards:
+        assert len({index.partition(":")[0] for index in shard}) == 1
+
+    expected = []
+    for idx, region in enumerate(REGIONS):
+        chrom, start_end = region.split(":")
+        sequence = _genome_slice(chrom, *map(int, start_end.split("-")))
+        for strand_sequence in [sequence, _reverse_complement(sequence)]:
+            expected.append((strand_sequence, regions_adata.X[:, idx]))
+    assert len(samples) == len(expected)
+    for sequence, target in expected:
+        x = one_hot_encode_sequence(sequence, expand_dim=False)
+        matches = [
+            i for i, (sample_x, _) in enumerate(samples) if np.array_equal(sample_x, x)
+        ]
+        assert len(matches) == 1
+        np.testing.assert_allclose(samples[matches[0]][1], target, rtol=1e-6)
+
+
+@pytest.mark.skipif(
+    os.environ["KERAS_BACKEND"] != "tensorflow",
+    reason="caching is only used with the tensorflow backend",
+)
+def test_anndataloader_cache(regions_adata, monkeypatch):
+    dataset = AnnDataset(regions_adata, GENOME_FILE, in_memory=False)
+    n_reads = 0
+    get_sequence = dataset.sequence_loader.get_sequence
+
+    def counting_get_sequence(*args, **kwargs):
+        nonlocal n_reads
+        n_reads += 1
+        return get_sequence(*args, **kwargs)
+
+    monkeypatch.setattr(dataset.sequence_loader, "get_sequence", counting_get_sequence)
+    loader = AnnDataLoader(dataset, batch_size=3, drop_remainder=False, cache=True)
+    batches = [
+        (np.asarray(x), np.asarray(y))
+        for x, y in itertools.islice(loader.data, 2 * len(loader))
+    ]
+
+    # the second pass is identical and served from the cache
+    for (x1, y1), (x2, y2) in zip(batches[: len(loader)], batches[len(loader) :]):
+        np.testing.assert_array_equal(x1, x2)
+        np.testing.assert_array_equal(y1, y2)
+    assert n_reads == len(dataset)
+
+
+@pytest.mark.parametrize(
+    "shuffle, dataset_kwargs",
+    [
+        (True, {}),
+        (False, {"random_reverse_complement": True}),
+        (False, {"max_stochastic_shift": 10}),
+    ],
+)
+def test_anndataloader_cache_ignored_when_random(
+    regions_adata, shuffle, dataset_kwargs
+):
+    dataset = AnnDataset(regions_adata, GENOME_FILE, in_memory=False, **dataset_kwargs)
+    loader = AnnDataLoader(dataset, batch_size=3, shuffle=shuffle, cache=True)
+
+    assert not loader._is_deterministic()
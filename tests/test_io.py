@@ -7,15 +7,37 @@ from anndata import AnnData
 import crested
 
 
-def test_package_has_version():
-    assert crested.__version__ is not None
+@pytest.fixture(scope="session")
+def beds_adata():
+    return crested.import_beds(
+        beds_folder="tests/data/test_topics",
+        regions_file="tests/data/test.regions.bed",
+    )
 
 
-def test_import_beds_shape():
-    ann_data = crested.import_beds(
+@pytest.fixture(scope="session")
+def beds_adata_compressed():
+    return crested.import_beds(
         beds_folder="tests/data/test_topics",
         regions_file="tests/data/test.regions.bed",
+        compress=True,
+    )
+
+
+@pytest.fixture(scope="session")
+def bigwigs_adata():
+    return crested.import_bigwigs(
+        bigwigs_folder="tests/data/test_bigwigs",
+        regions_file="tests/data/test_bigwigs/consensus_peaks_subset.bed",
     )
+
+
+def test_package_has_version():
+    assert crested.__version__ is not None
+
+
+def test_import_beds_shape(beds_adata):
+    ann_data = beds_adata
     # Test type
     assert isinstance(ann_data, AnnData)
 
@@ -40,25 +62,33 @@ def test_import_beds_classes_subset():
     assert ann_data.shape[0] == 2
 
 
+def test_import_beds_missing_classes():
+    with pytest.raises(FileNotFoundError, match="Topic_8', 'Topic_9"):
+        crested.import_beds(
+            beds_folder="tests/data/test_topics",
+            classes_subset=["Topic_1", "Topic_8", "Topic_9"],
+        )
+
+
+def test_import_beds_chromosomes_without_prefix():
+    ann_data = crested.import_beds(beds_folder="tests/data/test_topics_no_chr")
+    assert ann_data.shape == (2, 7)
+    assert set(ann_data.var["chr"]) == {"1", "2", "10", "22", "X", "MT"}
+    assert "X:100-600" in ann_data.var_names
+    assert ann_data.var.loc["X:100-600", "n_classes"] == 2
+
+
 def test_import_beds_invalid_files():
     with pytest.raises(FileNotFoundError):
         crested.import_beds(beds_folder="invalid_folder", regions_file="invalid_file")
 
 
-def test_import_beds_compression():
-    ann_data_c = crested.import_beds(
-        beds_folder="tests/data/test_topics",
-        regions_file="tests/data/test.regions.bed",
-        compress=True,
-    )
+def test_import_beds_compression(beds_adata, beds_adata_compressed):
+    ann_data_c = beds_adata_compressed
     assert ann_data_c.X.getformat() == "csr"
     assert ann_data_c.X.shape == (3, 23186)
 
-    ann_data = crested.import_beds(
-        beds_folder="tests/data/test_topics",
-        regions_file="tests/data/test.regions.bed",
-        compress=False,
-    )
+    ann_data = beds_adata
     assert isinstance(ann_data.X, np.ndarray)
     assert ann_data.X.shape == (3, 23186)
 
@@ -77,11 +107,8 @@ def test_import_beds_chromsizes():
         assert region not in list(ann_data.var.index)
 
 
-def test_import_bigwigs_type():
-    ann_data = crested.import_bigwigs(
-        bigwigs_folder="tests/data/test_bigwigs",
-        regions_file="tests/data/test_bigwigs/consensus_peaks_subset.bed",
-    )
+def test_import_bigwigs_type(bigwigs_adata):
+    ann_data = bigwigs_adata
     # Test type
     assert isinstance(ann_data, AnnData)
 
@@ -93,11 +120,8 @@ def test_import_bigwigs_invalid_files():
         )
 
 
-def test_import_bigwigs_shape():
-    ann_data = crested.import_bigwigs(
-        bigwigs_folder="tests/data/test_bigwigs",
-        regions_file="tests/data/test_bigwigs/consensus_peaks_subset.bed",
-    )
+def test_import_bigwigs_shape(bigwigs_adata):
+    ann_data = bigwigs_adata
     # Test shape
     expected_number_of_bigwigs = 2
     expected_number_of_peaks = 5000
@@ -105,11 +129,8 @@ def test_import_bigwigs_shape():
     assert ann_data.shape == (expected_number_of_bigwigs, expected_number_of_peaks)
 
 
-def test_import_bigwigs_columns():
-    ann_data = crested.import_bigwigs(
-        bigwigs_folder="tests/data/test_bigwigs",
-        regions_file="tests/data/test_bigwigs/consensus_peaks_subset.bed",
-    )
+def test_import_bigwigs_columns(bigwigs_adata):
+    ann_data = bigwigs_adata
     # Test columns in .obs
     assert "file_path" in ann_data.obs.columns
 
@@ -1,6 +1,8 @@
+import numpy as np
 import pytest
 
 import crested
+from crested.pp._utils import _calc_gini, _calc_gini_scores
 
 from ._utils import create_anndata_with_regions
 
@@ -92,6 +94,39 @@ def test_train_val_test_split_by_chromosome_auto():
     assert train_count / total_count == pytest.approx(train_fraction, rel=1e-2)
 
 
+def test_calc_gini():
+    targets = np.array(
+        [
+            [0.0, 0.0, 1.0],
+            [1.0, 1.0, 1.0],
+            [0.0, 2.0, -1.0],
+        ]
+    )
+    gini_scores = _calc_gini(targets)
+
+    assert gini_scores.shape == targets.shape
+    # only the position of the maximum value per row holds a score
+    assert np.count_nonzero(gini_scores[[0, 2]], axis=1).tolist() == [1, 1]
+    assert gini_scores[0, 2] == pytest.approx(2 / 3, rel=1e-5)
+    assert gini_scores[1].max() == pytest.approx(0.0, abs=1e-6)
+    assert gini_scores[2, 1] == pytest.approx(2 / 3, rel=1e-5)
+    np.testing.assert_allclose(_calc_gini_scores(targets), gini_scores.max(axis=1))
+
+
+def test_filter_regions_on_specificity():
+    regions = [f"chr1:{i * 100}-{i * 100 + 100}" for i in range(10)]
+    adata = create_anndata_with_regions(regions, n_classes=5, random_state=42)
+    # make a single region highly specific to one class
+    adata.X[:, 3] = 0.0
+    adata.X[2, 3] = 10.0
+
+    crested.pp.filter_regions_on_specificity(adata, gini_std_threshold=1.0)
+
+    assert "chr1:300-400" in adata.var_names
+    assert adata.shape[0] == 5
+    assert 0 < adata.shape[1] < len(regions)
+
+
 # def test_normalization_consistency():
 #     regions = [
 #         "chr1:100-200",
@@ -0,0 +1,51 @@
+import keras
+import numpy as np
+
+import crested
+
+
+def _randomize_batchnorms(model):
+    rng = np.random.default_rng(0)
+    for layer in model.layers:
+        if isinstance(layer, keras.layers.BatchNormalization):
+            shape = layer.moving_mean.shape
+            layer.moving_mean.assign(rng.normal(0, 0.1, shape))
+            layer.moving_variance.assign(rng.uniform(0.5, 1.5, shape))
+            layer.gamma.assign(rng.uniform(0.5, 1.5, shape))
+            layer.beta.assign(rng.normal(0, 0.1, shape))
+
+
+def _count_batchnorms(model):
+    return sum(
+        isinstance(layer, keras.layers.BatchNormalization) for layer in model.layers
+    )
+
+
+def test_fold_batchnorm_zoo_model():
+    model = crested.tl.zoo.deeptopic_cnn(
+        seq_len=100, num_classes=3, filters=16, dense_out=8
+    )
+    _randomize_batchnorms(model)
+    folded = crested.utils.fold_batchnorm(model)
+
+    assert _count_batchnorms(folded) == 0
+    x = np.random.rand(2, 100, 4).astype("float32")
+    np.testing.assert_allclose(
+        model.predict(x, verbose=0), folded.predict(x, verbose=0), atol=1e-5
+    )
+
+
+def test_fold_batchnorm_skips_nonlinear_layers():
+    inputs = keras.Input(shape=(20, 4))
+    x = keras.layers.Conv1D(8, 3, activation="relu")(inputs)
+    x = keras.layers.BatchNormalization()(x)
+    outputs = keras.layers.Dense(2)(keras.layers.Flatten()(x))
+    model = keras.Model(inputs=inputs, outputs=outputs)
+    _randomize_batchnorms(model)
+    folded = crested.utils.fold_batchnorm(model)
+
+    assert _count_batchnorms(folded) == 1
+    x = np.random.rand(2, 20, 4).astype("float32")
+    np.testing.assert_allclose(
+        model.predict(x, verbose=0), folded.predict(x, verbose=0), atol=1e-5
+    )
@@ -0,0 +1,23 @@
+import keras
+import numpy as np
+import pytest
+
+import crested
+
+
+@pytest.mark.parametrize(
+    "build_model",
+    [crested.tl.zoo.deeptopic_cnn, crested.tl.zoo.simple_convnet],
+)
+def test_zoo_model_mixed_precision(build_model):
+    global_policy = keras.mixed_precision.global_policy().name
+    model = build_model(seq_len=500, num_classes=3, mixed_precision="mixed_bfloat16")
+
+    assert keras.mixed_precision.global_policy().name == global_policy
+    conv_layers = [
+        layer for layer in model.layers if isinstance(layer, keras.layers.Conv1D)
+    ]
+    assert conv_layers[0].dtype_policy.name == "mixed_bfloat16"
+    assert conv_layers[0].compute_dtype == "bfloat16"
+    outputs = model.predict(np.random.rand(2, 500, 4).astype("float32"), verbose=0)
+    assert outputs.dtype == np.float32